@@ -24,10 +24,73 @@ try:
 except ImportError:
     print("Can\'t import paramiko. If not installed, install it with \'pip install paramiko\'.")
 
+try:
+    # 'asyncssh' is an OPTIONAL backend for concurrent bulk submission.
+    # It shares the 'cryptography' backend with paramiko but speaks
+    # native asyncio, so many channels can be in flight at once.
+    import asyncssh
+except ImportError:
+    asyncssh = None
+
 # standard library imports
+import asyncio
+import functools
 import getpass
+import io
 import os, re
+import select
+import shlex
+import shutil
+import sys
 import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_exec(name):
+    # Resolve an executable name against PATH. 'shutil.which' is a pure
+    # Python scan (no 'which' subprocess) and the cache makes repeated Job
+    # construction (e.g. a big sweep) cost one lookup per unique executable.
+    return shutil.which(name) or name
+
+
+@functools.lru_cache(maxsize=None)
+def _abspath(path):
+    # A sweep constructs N Jobs pointing at the same program_file; caching
+    # makes that one getcwd syscall per unique path rather than one per Job
+    return os.path.abspath(path)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_pkey(path):
+    # Decoding a private key is CPU-bound crypto (ASN.1 parse + bignum
+    # checks); cache per path so reconnects don't re-pay it
+    return pmk.RSAKey.from_private_key_file(path)
+
+
+# Live, already-authenticated 'SSHClient' objects kept across 'condor'
+# contexts (a la OpenSSH ControlMaster). Keyed by (hostname, username, pkey);
+# each entry is (client, expires_at). Reusing one saves the full SSH
+# handshake (KEX + auth) per 'with condor(...)' block.
+_connection_pool = dict()
+_POOL_IDLE_TIMEOUT = 60  # seconds a pooled connection stays valid after use
+
+
+# Requirement-line templates, parsed once at import time. Bound '.format'
+# methods skip per-call f-string construction in Configuration's
+# attribute builder.
+_REQ_MACHINE_IS = '(machine == \"{}\")'.format
+_REQ_MACHINE_NOT = '(machine != \"{}\")'.format
+_REQ_GMEM_MIN = '(CUDAGlobalMemoryMb > {})'.format
+_REQ_GMEM_MAX = '(CUDAGlobalMemoryMb < {})'.format
+_REQ_CUDA_CAP = '(CUDACapability > {})'.format
+
+
+# 'condor_submit' reports 'N job(s) submitted to cluster xxxxx' once per
+# queue block; compiled once so batched submissions don't re-build it
+_CLUSTER_RE = re.compile(r'submitted to cluster (\d+)')
 
 
 class Job(object):
@@ -39,6 +102,23 @@ class Job(object):
     ON_EXIT = 'ON_EXIT'
     ON_EXIT_OR_EVICT = 'ON_EXIT_OR_EVICT'
 
+    # Attribute-line templates, parsed once at class creation and filled
+    # per instance with 'format_map' over the instance dict
+    _SHARED_ATTR_TEMPLATE = (
+        'executable = {executable}\n'
+        'should_transfer_files = {should_transfer_files}\n'
+        'when_to_transfer_output = {when_to_transfer_output}\n'
+        'stream_output = {stream_output}\n'
+        '+CanCheckpoint = {can_checkpoint}\n'
+        '+JobRunTime = {approx_runtime}'
+    )
+    _PER_JOB_ATTR_TEMPLATE = (
+        'arguments = {arguments}\n'
+        'log = {logfile}.log\n'
+        'error = {logfile}.err\n'
+        'output = {logfile}.out'
+    )
+
     def __init__(self,
                  executable=None,  # The executable to run. E.g.: 'bash', 'python' etc.
                  program_file=None,  # The file to run. If 'None', it is basically a command invocation
@@ -67,17 +147,17 @@ class Job(object):
         self.approx_runtime = str(approx_runtime)
         self.tag = tag
 
-        if not os.path.exists(artifact_dir):
-            # create the artifact directory, if doesn't exist
-            os.makedirs(artifact_dir)
+        # create the artifact directory, if doesn't exist (one syscall,
+        # no exists-then-create race)
+        os.makedirs(artifact_dir, exist_ok=True)
         self.artifact_dir = artifact_dir
         logfile = f"{'' if self.tag is None else self.tag}$(cluster).$(process)"
         self.logfile = os.path.join(self.artifact_dir, logfile)
         self.executable = executable if os.path.isabs(executable) \
-            else os.popen(f'which {executable}').read()[:-1]
+            else _resolve_exec(executable)
         if program_file != None:
             self.program_file = program_file if os.path.isabs(program_file) \
-                else os.path.abspath(program_file)
+                else _abspath(program_file)
         else:
             self.program_file = ''  # Empty string helps constructing the full command
 
@@ -85,48 +165,68 @@ class Job(object):
             self.pos_arguments = pos_arguments
         else:
             # construct the position argument sub-string from the list
-            pos_arglist = [str(a) for a in pos_arguments]
-            self.pos_arguments = ' '.join(pos_arglist)
+            self.pos_arguments = ' '.join(map(str, pos_arguments))
 
         if isinstance(arguments, str):
             self.arguments = arguments
         else:
             # construct the argument line from dict. e.g. '-p3 -q1 --gpu --batch 32'
-            arglist = ['-' + str(k) + str(v) if len(k) == 1
-                       else '--' + str(k) + ' ' + str(v)
-                       for k, v in arguments.items()]
-            self.arguments = ' '.join(arglist)
+            # (generator form: no intermediate list, one pass inside join)
+            self.arguments = ' '.join(f'-{k}{v}' if len(k) == 1 else f'--{k} {v}'
+                                      for k, v in arguments.items())
 
         # construct full argument string
-        self.arguments = ' '.join([self.program_file, self.pos_arguments, self.arguments])
+        self.arguments = f'{self.program_file} {self.pos_arguments} {self.arguments}'
 
-    def get_attributes(self):
-        all_attrs = [
-            f'executable = {self.executable}',
-            f'arguments = {self.arguments}',
-
-            f'should_transfer_files = {self.should_transfer_files}',
-            f'when_to_transfer_output = {self.when_to_transfer_output}',
-            f'stream_output = {self.stream_output}',
-
-            # logging files
-            f'log = {self.logfile}.log',
-            f'error = {self.logfile}.err',
-            f'output = {self.logfile}.out',
-
-            # new requirements for condor
-            f'+CanCheckpoint = {self.can_checkpoint}',
-            f'+JobRunTime = {self.approx_runtime}'
-        ]
+        # attribute lines are rendered lazily, then cached -- a Job reused
+        # across several submit calls pays the rendering only once
+        self._shared_attrs = None
+        self._per_job_attrs = None
+
+    def get_shared_attributes(self):
+        if self._shared_attrs is not None:
+            return self._shared_attrs
+
+        # Attributes that are (usually) identical across jobs of one batch;
+        # written once at the top of a multi-queue submit file
+        self._shared_attrs = self._SHARED_ATTR_TEMPLATE.format_map(self.__dict__).split('\n')
+        return self._shared_attrs
+
+    def get_job_attributes(self):
+        if self._per_job_attrs is not None:
+            return self._per_job_attrs
+
+        # Attributes that differ from job to job; written once per 'queue'
+        per_job_attrs = self._PER_JOB_ATTR_TEMPLATE.format_map(self.__dict__).split('\n')
 
         if self.tag is not None:
-            all_attrs.insert(0, f'JobBatchName = \"{self.tag}\"')
+            per_job_attrs.insert(0, f'JobBatchName = \"{self.tag}\"')
+
+        self._per_job_attrs = per_job_attrs
+        return per_job_attrs
 
-        return all_attrs
+    def get_attributes(self):
+        shared_attrs, per_job_attrs = self.get_shared_attributes(), self.get_job_attributes()
+        if self.tag is not None:
+            # keep 'JobBatchName' as the very first attribute
+            return [per_job_attrs[0], *shared_attrs, *per_job_attrs[1:]]
+        return [*shared_attrs, *per_job_attrs]
 
 
 class Configuration(object):
 
+    # see Job: the fixed lines live in a class-level template filled
+    # once per instance
+    _ATTR_TEMPLATE = (
+        'universe = {universe}\n'
+        'docker_image = {docker_image}\n'
+        'request_CPUs = {request_CPUs}\n'
+        'request_GPUs = {request_GPUs}\n'
+        'request_memory = {request_memory}\n'
+        'requirements = {requirements}\n'
+        '+GPUMem = {gpu_memory_min}'
+    )
+
     def __init__(self, *,
                  universe='docker',
                  docker_image='python:3.7.10-slim',
@@ -161,35 +261,47 @@ class Configuration(object):
         self.restricted_machines = restricted_machines # do not use these machines
         self.allowed_machines = allowed_machines
 
+        # All fields are fixed at construction, so render the attribute
+        # lines once -- a batch of N jobs sharing one Configuration would
+        # otherwise rebuild the same requirements string N times
+        self._cached_attrs = tuple(self._build_attributes())
+
+    def _build_attributes(self):
+        # Requirement list separated by '&&' in 'requirement' attribute.
+        # Built incrementally behind guards: inactive clauses never render
+        # and there are no 'None' placeholders to filter afterwards
+        parts = []
+        append = parts.append
+        if self.has_storenext:
+            append('(HasStornext)')
+        if self.has_weka:
+            append('(HasWeka)')
+        if self.request_GPUs != 0:
+            append(_REQ_GMEM_MIN(self.gpu_memory_min))
+            append(_REQ_GMEM_MAX(self.gpu_memory_max))
+            append(_REQ_CUDA_CAP(self.cuda_capability))
+        if self.no_priority:
+            append('(NotProjectOwned)')
+        if self.restricted_machines:
+            restricted_machine_req = ' && '.join(_REQ_MACHINE_NOT(mach) for mach in self.restricted_machines)
+            append(f'({restricted_machine_req})')
+        if self.allowed_machines:
+            allowed_machine_req = ' || '.join(_REQ_MACHINE_IS(mach) for mach in self.allowed_machines)
+            append(f'({allowed_machine_req})')
+        requirements = ' && '.join(parts)
+
+        return self._ATTR_TEMPLATE.format_map(
+            {**self.__dict__, 'requirements': requirements}).split('\n')
+
     def get_attributes(self):
-        allowed_machine_req = ' || '.join([f'(machine == \"{mach}\")' for mach in self.allowed_machines])
-        restricted_machine_req = ' && '.join([f'(machine != \"{mach}\")' for mach in self.restricted_machines])
-
-        requirements = [
-            # Requirement list separated by '&&' in 'requirement' attribute
-            f'(HasStornext)' if self.has_storenext else None,
-            f'(HasWeka)' if self.has_weka else None,
-            f'(CUDAGlobalMemoryMb > {self.gpu_memory_min})' if self.request_GPUs != 0 else None,
-            f'(CUDAGlobalMemoryMb < {self.gpu_memory_max})' if self.request_GPUs != 0 else None,
-            f'(CUDACapability > {self.cuda_capability})' if self.request_GPUs != 0 else None,
-            f'(NotProjectOwned)' if self.no_priority else None,
-            f'({restricted_machine_req})' if len(self.restricted_machines) > 0 else None,
-            f'({allowed_machine_req})' if len(self.allowed_machines) > 0 else None
-        ]
-        requirements = ' && '.join([r for r in requirements if r != None])
-
-        return [
-            f'universe = {self.universe}',
-            f'docker_image = {self.docker_image}',
-            f'request_CPUs = {self.request_CPUs}',
-            f'request_GPUs = {self.request_GPUs}',
-            f'request_memory = {self.request_memory}',
-            f'requirements = {requirements}',
-            f'+GPUMem = {self.gpu_memory_min}'
-        ]
+        return self._cached_attrs
 
 
+@functools.lru_cache(maxsize=None)
 def get_top_level_mount(project_space=None):
+    # Cached: the answer never changes within a process, and the isdir
+    # check below is a network RPC on NFS-mounted project storage --
+    # not something to pay once per submission in a sweep loop
     cwd = os.getcwd()
     home = os.path.expanduser('~')
     if cwd.startswith(home):
@@ -218,7 +330,8 @@ def env_string(env_list, extra_mounts=[], is_docker=True, project_space=None):
         envs_pairs.append(f'mount={mount_dirs_comma_sep}')
 
     if len(env_list) != 0:
-        envs_pairs.extend([f'{e}={os.environ[e]}' for e in env_list])
+        env = os.environ  # bind once; skip repeated global/attr lookups
+        envs_pairs.extend(f'{e}={env[e]}' for e in env_list)
 
     joined_envs = ' '.join(envs_pairs)
     return f'environment = \"{joined_envs}\"'
@@ -233,10 +346,19 @@ class condor(object):
 
                  # All keys inside options are optional
                  # 'options.known_hosts' contain the filepath for unconventional 'known_hosts' file
-                 options=dict()
+                 options=dict(),
+                 backend='paramiko'  # 'paramiko' (default) or 'asyncssh'
                  ):
 
         # Track the parameters
+        assert backend in ['paramiko', 'asyncssh'], 'backend can either be \"paramiko\" or \"asyncssh\"'
+        if backend == 'asyncssh':
+            assert asyncssh is not None, \
+                'asyncssh backend requested but not installed; install it with \'pip install asyncssh\''
+        self.backend = backend
+        self._aconn = None  # lazy asyncssh connection (only for the async paths)
+        self._sftp = None  # lazy SFTP channel, shared by all uploads in a context
+        self._env_cache = dict()  # rendered 'environment = ...' lines, per config shape
         self.master_hostname = master_hostname
         self.username = getpass.getuser() if (username == None) else username
         assert project_space is not None, "Please provide the name of your project space folder"
@@ -254,12 +376,46 @@ class condor(object):
         self.client.set_missing_host_key_policy(
             pmk.AutoAddPolicy())  # add automatically if not known
 
+    def _get_pkey(self):
+        pkey = self.options.get('pkey')
+        if isinstance(pkey, str):
+            # a filepath was given instead of a loaded key object
+            pkey = _load_pkey(pkey)
+        return pkey
+
+    def _pool_key(self):
+        pkey = self.options.get('pkey')
+        if hasattr(pkey, 'get_fingerprint'):
+            # key objects aren't hashable across reloads; fingerprint is
+            pkey = pkey.get_fingerprint()
+        return (self.master_hostname, self.username, pkey)
+
+    @staticmethod
+    def close_pool():
+        # Explicit teardown of every pooled connection
+        for client, _ in _connection_pool.values():
+            client.close()
+        _connection_pool.clear()
+
     def __enter__(self):
+        pooled = _connection_pool.pop(self._pool_key(), None)
+        if pooled is not None:
+            client, expires_at = pooled
+            transport = client.get_transport()
+            if (transport is not None) and transport.is_active() and (time.time() < expires_at):
+                # reuse the authenticated transport; skip KEX + auth entirely
+                self.client = client
+                self.transport = transport
+                self.transport.set_keepalive(30)
+                return self
+            # expired or dead; dispose and fall through to a fresh connect
+            client.close()
+
         try:
             self.client.connect(hostname=self.master_hostname,
                                 username=self.username,
                                 # first try with private-key (password-less ssh), if found of given
-                                pkey=None if 'pkey' not in self.options else self.options['pkey'])
+                                pkey=self._get_pkey())
         except pmk.AuthenticationException:
             print('No valid public-private key found. Setting up password-less ssh is recommended.')
             print('Trying with password ...')
@@ -271,42 +427,128 @@ class condor(object):
             except pmk.AuthenticationException:
                 print('Password didn\'t work either.')
 
+        # cache the transport and keep it alive between commands
+        self.transport = self.client.get_transport()
+        if self.transport is not None:
+            self.transport.set_keepalive(30)
         return self
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
-        self.client.close()
+        if self._sftp is not None:
+            # the SFTP channel doesn't outlive the context
+            self._sftp.close()
+            self._sftp = None
+        # Don't close -- park the authenticated client in the pool so the
+        # next 'with condor(...)' block (within the idle timeout) reuses it.
+        # Use 'condor.close_pool()' for explicit teardown.
+        key = self._pool_key()
+        displaced = _connection_pool.get(key)
+        if (displaced is not None) and (displaced[0] is not self.client):
+            # interleaved contexts sharing a key: close the spare instead
+            # of leaking a kept-alive connection for the process lifetime
+            displaced[0].close()
+        _connection_pool[key] = (self.client, time.time() + _POOL_IDLE_TIMEOUT)
+        if self._aconn is not None:
+            # the asyncssh connection (if one was opened) isn't pooled
+            self._aconn.close()
+            self._aconn = None
     
     def _parse_cluster_id(self, messages):
-        _, message = messages
-        # The second line of the output message must have the format ..
-        # '1 job(s) submitted to cluster xxxxx. If that isn't the case
+        # The output message must contain exactly one line of the format
+        # '1 job(s) submitted to cluster xxxxx'. If that isn't the case
         # something is wrong; contact library author
-        numbers = re.findall(r'\b\d+\b', message)
-        assert (int(numbers[0]) == 1) and (len(numbers) == 2), \
+        cluster_ids = _CLUSTER_RE.findall(''.join(messages))
+        assert len(cluster_ids) == 1, \
             "Couldn't parse the output message; please contact the author."
-        return int(numbers[1])
+        return int(cluster_ids[0])
 
-    def execute(self, command):
-        _, out, err = self.client.exec_command(command, get_pty=True)
-        out, err = out.readlines(), err.readlines()
-
-        if len(err) == 0:
-            for line in out:
-                print(line, end='')
-            return (True, out)
+    def _parse_cluster_ids(self, messages):
+        # A multi-queue submit file produces one 'N job(s) submitted to
+        # cluster xxxxx' line per queue block; collect every cluster ID
+        cluster_ids = _CLUSTER_RE.findall(''.join(messages))
+        assert len(cluster_ids) > 0, \
+            "Couldn't parse the output message; please contact the author."
+        return [int(c) for c in cluster_ids]
+
+    def execute(self, command, interactive=False, timeout=30):
+        # Drive the channel directly and drain stdout/stderr INTERLEAVED
+        # via select -- the old 'stdout.readlines() then stderr.readlines()'
+        # order could deadlock once a command filled its stderr pipe, and
+        # it ignored the exit status entirely. No PTY unless explicitly
+        # requested: condor_submit/condor_q are non-interactive, a pseudo
+        # terminal costs extra remote-side setup AND merges the streams.
+        chan = self.transport.open_session(timeout=timeout)
+        if interactive:
+            chan.get_pty()
+        chan.exec_command(command)
+
+        out_buf, err_buf = bytearray(), bytearray()
+        written = 0  # how much of out_buf reached the terminal already
+        while True:
+            select.select([chan], [], [], timeout)
+            while chan.recv_ready():
+                out_buf += chan.recv(65536)
+            while chan.recv_stderr_ready():
+                err_buf += chan.recv_stderr(65536)
+
+            # stream stdout progressively, flushed in ~8 KiB batches
+            if len(out_buf) - written >= 8192:
+                sys.stdout.write(out_buf[written:].decode(errors='replace'))
+                sys.stdout.flush()
+                written = len(out_buf)
+
+            if chan.exit_status_ready() \
+                    and not chan.recv_ready() and not chan.recv_stderr_ready():
+                break
+        exit_status = chan.recv_exit_status()
+        chan.close()
+
+        if written < len(out_buf):
+            sys.stdout.write(out_buf[written:].decode(errors='replace'))
+            sys.stdout.flush()
+
+        out_lines = out_buf.decode(errors='replace').splitlines(keepends=True)
+        err_lines = err_buf.decode(errors='replace').splitlines(keepends=True)
+        if len(err_lines) > 0:
+            # stderr belongs on stderr, but it's informational only --
+            # condor_submit routinely warns there and still queues the jobs
+            sys.stderr.write(''.join(err_lines))
+
+        # the exit status alone is the verdict
+        if exit_status == 0:
+            return (True, out_lines)
         else:
-            for line in err:
-                print(line, end='')
-            return (False, err)
-        
+            return (False, err_lines if len(err_lines) > 0 else out_lines)
+
         # basically return (status, mesasges_list)
 
-    def submit(self, job, config, keep_condor_file=False, dry_run=False):
-        envs = env_string(self.export_envs, config.extra_mounts,
-                          is_docker=(config.universe == 'docker'),
-                          project_space=self.project_space)
+    @staticmethod
+    def _submit_command(remote_path):
+        # shell-quoted, so an odd character in the path can never split the
+        # command; '&&' guarantees cleanup only runs after a real submit
+        remote_path = shlex.quote(remote_path)
+        return f'condor_submit {remote_path} && rm -f {remote_path}'
+
+    def _env_line(self, config):
+        # The env block only depends on the universe and the extra mounts
+        # (export_envs and project_space are fixed per condor object), so a
+        # sweep sharing one Configuration expands the environment variables
+        # and mount list exactly once
+        key = (config.universe, tuple(config.extra_mounts))
+        line = self._env_cache.get(key)
+        if line is None:
+            line = env_string(self.export_envs, config.extra_mounts,
+                              is_docker=(config.universe == 'docker'),
+                              project_space=self.project_space)
+            self._env_cache[key] = line
+        return line
+
+    def _build_submit_text(self, job, config):
+        # Pure helper: renders the complete submit file for ONE job as a
+        # string -- no filesystem or network I/O, so dry runs (and tests)
+        # can inspect the output without touching disk
+        envs = self._env_line(config)
 
-        # full attributes list (job and system configurations)
         attributes = [
             '## HTCondor submit file',
             '#######################',
@@ -321,28 +563,248 @@ class condor(object):
             '# Queueing',
             'queue'
         ]
+        return '\n'.join(attributes) + '\n'
+
+    def _upload_submit_file(self, submit_text):
+        # Write the submit file directly on the remote host (under /tmp, with
+        # a unique name) over an SFTP channel; returns the remote path
+        remote_path = f'/tmp/condor-{uuid.uuid4().hex}.sub'
+        # the whole file goes up from an in-memory buffer in one shot;
+        # no local disk involved at any point
+        self.sftp.putfo(io.BytesIO(submit_text.encode()), remote_path)
+        return remote_path
+
+    @property
+    def sftp(self):
+        # one SFTP channel per context, opened on first use and reused for
+        # every upload -- repeated submissions skip the channel-open RTT
+        if self._sftp is None:
+            self._sftp = self.client.open_sftp()
+        return self._sftp
+
+    def execute_many(self, commands, max_workers=16):
+        # Run several independent commands concurrently over the SAME
+        # authenticated client -- paramiko opens a separate channel per
+        # exec_command, so they overlap in flight and the wall time for N
+        # commands approaches one round trip instead of N. Results come
+        # back in the same order as 'commands'.
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(self.execute, commands))
+
+    def execute_pipelined(self, commands, timeout=30):
+        # Pipeline several commands over the one persistent transport: open
+        # every channel back-to-back WITHOUT draining in between, then
+        # collect results in a second pass. The commands overlap in flight
+        # instead of each paying its own full round trip. Results mirror
+        # 'execute': a (status, messages_list) per command, in input order.
+        channels = []
+        for command in commands:
+            chan = self.transport.open_session()
+            chan.exec_command(command)
+            channels.append(chan)
+
+        results = []
+        for chan in channels:
+            out_buf, err_buf = bytearray(), bytearray()
+            while True:
+                select.select([chan], [], [], timeout)
+                if chan.recv_ready():
+                    out_buf += chan.recv(65536)
+                if chan.recv_stderr_ready():
+                    err_buf += chan.recv_stderr(65536)
+                if chan.exit_status_ready() \
+                        and not chan.recv_ready() and not chan.recv_stderr_ready():
+                    break
+            exit_status = chan.recv_exit_status()
+            chan.close()
+
+            out = out_buf.decode(errors='replace').splitlines(keepends=True)
+            err = err_buf.decode(errors='replace').splitlines(keepends=True)
+            # same verdict as 'execute': the exit status alone decides --
+            # stderr may carry warnings from a command that succeeded
+            if exit_status == 0:
+                results.append((True, out))
+            else:
+                results.append((False, err if len(err) > 0 else out))
+
+        return results
+
+    async def execute_async(self, command):
+        # asyncssh flavour of 'execute' (requires backend='asyncssh'). The
+        # connection is opened lazily on first use and shared by every
+        # subsequent call, so N gathered commands multiplex one transport.
+        assert asyncssh is not None, \
+            'execute_async needs asyncssh; install it with \'pip install asyncssh\''
+        if self._aconn is None:
+            pkey = self.options.get('pkey')
+            # asyncssh can't consume a loaded paramiko key object -- only a
+            # filepath works for both backends, so insist on one here
+            assert (pkey is None) or isinstance(pkey, str), \
+                'the asyncssh backend needs options[\'pkey\'] as a filepath, not a loaded paramiko key'
+            self._aconn = await asyncssh.connect(
+                self.master_hostname,
+                username=self.username,
+                client_keys=None if pkey is None else [pkey],
+                known_hosts=self.options.get('known_hosts'))
+
+        result = await self._aconn.run(command, check=False)
+        out, err = result.stdout.splitlines(keepends=True), result.stderr.splitlines(keepends=True)
+
+        # mirror 'execute': (status, messages_list), with the exit status
+        # alone as the verdict -- condor_submit warns on stderr and exits 0
+        if len(err) > 0:
+            sys.stderr.write(''.join(err))
+        if result.exit_status == 0:
+            return (True, out)
+        else:
+            return (False, err if len(err) > 0 else out)
 
-        with open(tempfile.mktemp(suffix='.submit_file', prefix='condor', dir='.'), 'w') as submitfile:
-            for attr in attributes:
-                submitfile.write(attr + '\n')
+    def submit(self, job, config, keep_condor_file=False, dry_run=False):
+        # Thin wrapper: a single job is just a batch of one
+        result = self.submit_many([job], config,
+                                  keep_condor_file=keep_condor_file, dry_run=dry_run)
+        if dry_run:
+            # the rendered submit-file text
+            return result
+        # single cluster ID (or -1 if the submission didn't succeed)
+        return result[0] if len(result) > 0 else -1
+
+    def submit_many(self, jobs, config, keep_condor_file=False, dry_run=False):
+        # Batched counterpart of 'submit'. Writes ONE submit file containing a
+        # 'queue' block per job and invokes 'condor_submit' exactly once -- so a
+        # loop of N jobs pays one SSH round trip and one schedd transaction
+        # instead of N of each.
+        assert len(jobs) > 0, 'Provide at least one Job to submit'
+        shared_attrs = jobs[0].get_shared_attributes()
+        for job in jobs[1:]:
+            # all jobs in a batch must agree on the attributes written
+            # once at the top of the submit file
+            assert job.get_shared_attributes() == shared_attrs, \
+                'All jobs in a batch must share executable and transfer/runtime settings'
+        if any(job.tag is not None for job in jobs):
+            # In the submit language an attribute persists across later
+            # 'queue' statements, so an untagged job queued after a tagged
+            # one would silently inherit the earlier 'JobBatchName'
+            assert all(job.tag is not None for job in jobs), \
+                'Either all jobs in a batch carry a tag or none of them do'
+
+        envs = self._env_line(config)
+
+        # shared attributes (job and system configurations) written once
+        attributes = [
+            '## HTCondor submit file',
+            '#######################',
+
+            '# Job configurations',
+            envs,
+            *shared_attrs,
+
+            '# System configurations',
+            *config.get_attributes(),
+
+            '# Queueing (one block per job)'
+        ]
+        for job in jobs:
+            attributes.extend([*job.get_job_attributes(), 'queue 1'])
+        submit_text = '\n'.join(attributes) + '\n'
 
-            # get the full filename
-            submit_filename = os.path.abspath(submitfile.name)
+        if dry_run:
+            # hand back the whole batched submit file as text, I/O-free
+            return submit_text
 
-        pwd = os.path.abspath('.')
-        if not dry_run:
-            # status == True means 'executed successfully'
-            status, msg = self.execute(f'cd {pwd}; condor_submit {submit_filename}')
+        if keep_condor_file:
+            # keep a local copy for inspection
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.submit_file',
+                                             prefix='condor', dir='.', delete=False) as submitfile:
+                submitfile.write(submit_text)
+
+        # one SFTP upload + one condor_submit for the whole batch
+        remote_path = self._upload_submit_file(submit_text)
+        # status == True means 'executed successfully'
+        status, msg = self.execute(self._submit_command(remote_path))
+
+        if status:
+            return self._parse_cluster_ids(msg)
         else:
-            # dry run is always unsuccessful
-            status, msg = False, [ ]
+            # didn't succeed
+            return [ ]
+
+    def submit_grid(self, job_template, config, grid, keep_condor_file=False, dry_run=False):
+        # One submit transaction for an ENTIRE Grid sweep: the varying
+        # arguments become $(var) substitutions and the combinations go
+        # into a single 'queue ... from (...)' item list. N jobs cost one
+        # SSH round trip and one schedd transaction; '$(process)' keeps
+        # the log files apart.
+        envs = self._env_line(config)
+
+        # the swept variables, rendered exactly like Job's keyword arguments
+        grid_args = ' '.join(f'-{v}$({v})' if len(v) == 1 else f'--{v} $({v})'
+                             for v in grid.vars)
+
+        attributes = [
+            '## HTCondor submit file',
+            '#######################',
+
+            '# Job configurations',
+            envs,
+            *job_template.get_shared_attributes(),
 
-        keep_condor_file = keep_condor_file or dry_run
-        if not keep_condor_file:
-            os.remove(submit_filename)
+            '# System configurations',
+            *config.get_attributes(),
+
+            '# Job arguments and logging',
+        ]
+        if job_template.tag is not None:
+            attributes.append(f'JobBatchName = \"{job_template.tag}\"')
+        attributes.extend([
+            f'arguments = {job_template.arguments} {grid_args}',
+            f'log = {job_template.logfile}.log',
+            f'error = {job_template.logfile}.err',
+            f'output = {job_template.logfile}.out',
+
+            '# Queueing (itemdata: one line per grid combination)',
+            f'queue {", ".join(grid.vars)} from ('
+        ])
+        for comb in grid:
+            attributes.append(f"  {', '.join(str(v) for v in comb)}")
+        attributes.append(')')
+        submit_text = '\n'.join(attributes) + '\n'
+
+        if dry_run:
+            return submit_text
+
+        if keep_condor_file:
+            # keep a local copy for inspection
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.submit_file',
+                                             prefix='condor', dir='.', delete=False) as submitfile:
+                submitfile.write(submit_text)
+
+        remote_path = self._upload_submit_file(submit_text)
+        # status == True means 'executed successfully'
+        status, msg = self.execute(self._submit_command(remote_path))
 
         if status:
-            return self._parse_cluster_id(msg)
+            return self._parse_cluster_ids(msg)
         else:
-            # didn't succeed or dry run
-            return -1
\ No newline at end of file
+            # didn't succeed
+            return [ ]
+
+    async def submit_many_async(self, jobs, config, max_inflight=10, min_interval=None):
+        # Concurrent alternative to 'submit_many': one submit file per job,
+        # fanned out with asyncio (requires the asyncssh backend). At most
+        # 'max_inflight' condor_submit calls are in the air at once -- the
+        # schedd applies back-pressure to rapid submission floods -- and
+        # 'min_interval' (seconds) additionally spaces consecutive calls.
+        remote_paths = [self._upload_submit_file(self._build_submit_text(job, config))
+                        for job in jobs]
+
+        semaphore = asyncio.Semaphore(max_inflight)
+
+        async def _submit_one(remote_path):
+            async with semaphore:
+                if min_interval is not None:
+                    await asyncio.sleep(min_interval)
+                status, msg = await self.execute_async(self._submit_command(remote_path))
+            return self._parse_cluster_id(msg) if status else -1
+
+        return list(await asyncio.gather(*(_submit_one(p) for p in remote_paths)))
\ No newline at end of file
@@ -1,5 +1,6 @@
 from collections import OrderedDict, namedtuple
 from itertools import product
+from math import prod
 
 class Grid:
 
@@ -10,23 +11,25 @@ class Grid:
         for val in self.gdict.values():
             if not isinstance(val, (list, tuple)):
                 raise TypeError('Each parameter set must be denoted by a list/tuple')
-            
+
             self.values.append(val)
-        
-        self.combs = list(product(*self.values))
-        
+
         self.combination = namedtuple('Combination', self.vars)
-    
+        self._iter = None
+
     def __iter__(self):
-        self.i = -1
+        # stream the combinations lazily; a wide sweep no longer
+        # materializes the full cartesian product up front
+        self._iter = product(*self.values)
         return self
-    
+
     def __next__(self):
-        if self.i < len(self.combs) - 1:
-            self.i += 1
-            return self.combination(*self.combs[self.i])
-        else:
-            raise StopIteration()
+        # '_make' skips the *args unpacking of the regular constructor
+        return self.combination._make(next(self._iter))
+
+    def __len__(self):
+        # number of combinations, computed without materializing them
+        return prod(len(v) for v in self.values)
 
 
 if __name__ == '__main__':